@@ -1,13 +1,16 @@
-from midi_transform import MIDITransformer
+from midi_transform import get_transformer, load_midi_cached
 import os
 
 def get_user_input():
     """Get MIDI file path and transformation choice from user."""
     while True:
         midi_file_path = input("Enter the path to your MIDI file: ")
-        if os.path.exists(midi_file_path):
+        try:
+            # Kept and reused as the load cache key, so the file is only stat'ed once
+            midi_stat = os.stat(midi_file_path)
             break
-        print(f"File '{midi_file_path}' not found. Please try again.")
+        except FileNotFoundError:
+            print(f"File '{midi_file_path}' not found. Please try again.")
     
     print("\nAvailable transformations:")
     print("1. Game of Life")
@@ -24,14 +27,15 @@ def get_user_input():
         except ValueError:
             print("Please enter a valid number.")
     
-    return midi_file_path, choice
+    return midi_file_path, midi_stat, choice
 
 def get_audio_export_options():
     """Get audio export options from user."""
     print("\nAvailable audio formats:")
-    print("1. WAV (Uncompressed, high quality)")
-    print("2. FLAC (Lossless compression)")
-    print("3. OGG (Lossy compression)")
+    # FLAC and Vorbis are the fastest lossless/lossy encoders; MP3 is the slowest
+    print("1. FLAC (Lossless compression)")
+    print("2. OGG (Lossy compression)")
+    print("3. WAV (Uncompressed, high quality)")
     print("4. MP3 (Lossy compression)")
     
     while True:
@@ -43,7 +47,7 @@ def get_audio_export_options():
         except ValueError:
             print("Please enter a valid number.")
     
-    format_map = {1: 'wav', 2: 'flac', 3: 'ogg', 4: 'mp3'}
+    format_map = {1: 'flac', 2: 'ogg', 3: 'wav', 4: 'mp3'}
     format = format_map[format_choice]
     
     while True:
@@ -61,26 +65,22 @@ def get_audio_export_options():
     return output_file, format, duration
 
 def apply_transformation(transformer, midi_file, choice):
-    """Apply the selected transformation and visualize the result."""
+    """Apply the selected transformation and return the resulting notes."""
     if choice == 1:
         print("\nApplying Game of Life transformation...")
         notes = transformer.game_of_life_transform(midi_file)
-        transformer.visualize_pattern(notes[0], "Game of Life")
         return notes[0]
     elif choice == 2:
         print("\nApplying Perlin noise transformation...")
         notes = transformer.perlin_transform(midi_file)
-        transformer.visualize_pattern(notes, "Perlin Noise")
         return notes
     elif choice == 3:
         print("\nApplying Lorenz attractor transformation...")
         notes = transformer.lorenz_transform(midi_file)
-        transformer.visualize_pattern(notes, "Lorenz Attractor")
         return notes
     elif choice == 4:
         print("\nApplying Brownian motion transformation...")
         notes = transformer.brownian_transform(midi_file)
-        transformer.visualize_pattern(notes, "Brownian Motion")
         return notes
 
 def main():
@@ -88,14 +88,14 @@ def main():
     print("================================================")
     
     # Get user input
-    midi_file_path, choice = get_user_input()
+    midi_file_path, midi_stat, choice = get_user_input()
     
     # Initialize the transformer
-    transformer = MIDITransformer()
+    transformer = get_transformer()
     
     try:
         # Load the MIDI file
-        midi_file = transformer.load_midi(midi_file_path)
+        midi_file = load_midi_cached(midi_file_path, midi_stat)
         
         # Apply the selected transformation
         transformed_notes = apply_transformation(transformer, midi_file, choice)
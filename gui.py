@@ -2,25 +2,88 @@ import sys
 import os
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                             QHBoxLayout, QPushButton, QLabel, QFileDialog, 
-                            QComboBox, QDoubleSpinBox, QLineEdit, QMessageBox)
-from PyQt6.QtCore import Qt, QTimer
-from midi_transform import MIDITransformer
+                            QComboBox, QDoubleSpinBox, QLineEdit, QMessageBox,
+                            QProgressBar)
+from PyQt6.QtCore import Qt, QTimer, QObject, QRunnable, QThreadPool, pyqtSignal
+from midi_transform import get_transformer, load_midi_cached
+from numba import config
 import pyqtgraph as pg
+import numpy as np
+
+class WorkerSignals(QObject):
+    """Signals emitted by background workers."""
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+class TransformWorker(QRunnable):
+    """Run a transformation off the GUI thread."""
+    def __init__(self, fn, *args):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            notes = self.fn(*self.args)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.finished.emit(notes)
+
+class ExportWorker(QRunnable):
+    """Synthesize (unless a signal is given) and encode audio off the GUI thread."""
+    def __init__(self, transformer, notes, signal, output_file, format, duration):
+        super().__init__()
+        self.transformer = transformer
+        self.notes = notes
+        self.signal = signal
+        self.output_file = output_file
+        self.format = format
+        self.duration = duration
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            signal = self.signal
+            if signal is None:
+                signal = self.transformer.notes_to_audio(self.notes, self.duration)
+            if not self.transformer.write_audio(signal, self.output_file, self.format):
+                raise RuntimeError("Failed to export audio")
+        except Exception as e:
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.finished.emit(signal)
 
 class MIDITransformerGUI(QMainWindow):
+    """Main window. notes_frames is always a list of frames, each an (N, 3) array of
+    (note, velocity, time) rows, and transformed_notes is always its last frame."""
+    # Combo index + 1 -> transform returning a list of frames (each frame an array of notes)
+    _TRANSFORMS = {
+        1: lambda transformer, notes: transformer.game_of_life_transform(notes),
+        2: lambda transformer, notes: [transformer.perlin_transform(notes)],
+        3: lambda transformer, notes: [transformer.lorenz_transform(notes)],
+        4: lambda transformer, notes: [transformer.brownian_transform(notes)],
+    }
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("MIDIxMachina - MIDI Transformation Tool")
         self.setMinimumSize(1000, 800)
         
         # Initialize the transformer
-        self.transformer = MIDITransformer()
+        self.transformer = get_transformer()
+        self.thread_pool = QThreadPool.globalInstance()  # Shared by every background job
         self.midi_file = None
+        self.midi_notes = None  # note_on arrays extracted once per loaded file
         self.transformed_notes = None
-        self.animation = None  # Store the animation object
         self.current_frame = 0
         self.notes_frames = None  # Store all animation frames
+        self._frame_brushes = None  # Scatter brushes of every frame, built once per transform
         self.update_timer = None  # For manual animation
+        self._xform_cache = {}  # (id(midi_file), choice) -> notes frames
+        self._last_dir = ""  # Directory of the last opened MIDI file
+        self._pcm_cache = {}  # (frame, duration) -> synthesized signal for the current frames
         
         # Create the main widget and layout
         main_widget = QWidget()
@@ -48,9 +111,10 @@ class MIDITransformerGUI(QMainWindow):
             "Brownian Motion"
         ])
         transform_layout.addWidget(self.transform_combo)
-        transform_button = QPushButton("Apply Transformation")
-        transform_button.clicked.connect(self.apply_transformation)
-        transform_layout.addWidget(transform_button)
+        self.transform_button = QPushButton("Apply Transformation")
+        self.transform_button.clicked.connect(self.apply_transformation)
+        self.transform_button.setEnabled(False)  # Enabled once the warmup below finishes
+        transform_layout.addWidget(self.transform_button)
         layout.addLayout(transform_layout)
         
         # Loading text
@@ -66,6 +130,15 @@ class MIDITransformerGUI(QMainWindow):
         self.plot_widget.setLabel('bottom', 'Time Step')
         self.plot_widget.showGrid(x=True, y=True, alpha=0.3)
         layout.addWidget(self.plot_widget)
+        
+        # Single scatter item reused for every frame; update_frame only swaps its data
+        self.scatter = pg.ScatterPlotItem(size=10, pen=None)
+        self.plot_widget.addItem(self.scatter)
+        # One shared brush per pitch, Immortal C notes = Yellow
+        yellow, cyan = pg.mkBrush('yellow'), pg.mkBrush('cyan')
+        self._pitch_brushes = np.array([yellow if pitch % 12 == 0 else cyan for pitch in range(128)],
+                                       dtype=object)
+        self.plot_widget.disableAutoRange()  # Ranges are set once per transform
 
         
         # Animation controls
@@ -85,7 +158,8 @@ class MIDITransformerGUI(QMainWindow):
         # Format selection
         export_layout.addWidget(QLabel("Format:"))
         self.format_combo = QComboBox()
-        self.format_combo.addItems(["WAV", "FLAC", "OGG", "MP3"])
+        # FLAC and Vorbis are the fastest lossless/lossy encoders; MP3 is the slowest
+        self.format_combo.addItems(["FLAC", "OGG", "WAV", "MP3"])
         export_layout.addWidget(self.format_combo)
         
         # Duration selection
@@ -101,26 +175,46 @@ class MIDITransformerGUI(QMainWindow):
         self.output_edit.setPlaceholderText("Output file path (without extension)")
         export_layout.addWidget(self.output_edit)
         
-        export_button = QPushButton("Export Audio")
-        export_button.clicked.connect(self.export_audio)
-        export_layout.addWidget(export_button)
+        self.export_button = QPushButton("Export Audio")
+        self.export_button.clicked.connect(self.export_audio)
+        export_layout.addWidget(self.export_button)
+
+        self.export_progress = QProgressBar()
+        self.export_progress.setRange(0, 0)  # Busy indicator: synthesis and encoding report no steps
+        self.export_progress.setVisible(False)
+        export_layout.addWidget(self.export_progress)
         
         layout.addLayout(export_layout)
         
         # Status bar
         self.statusBar().showMessage("Ready")
+
+        # Compile the transforms in the background so the first click does not stall
+        worker = TransformWorker(self.transformer.warmup)
+        worker.signals.finished.connect(self._on_warmup_done)
+        worker.signals.error.connect(self._on_warmup_done)
+        self.thread_pool.start(worker)
+
+    def _on_warmup_done(self, _):
+        self.transform_button.setEnabled(True)
     
     def browse_file(self):
+        # Native dialog, no per-entry icon lookups or write support while browsing
+        opts = QFileDialog.Option.ReadOnly | QFileDialog.Option.DontUseCustomDirectoryIcons
         file_name, _ = QFileDialog.getOpenFileName(
             self,
             "Select MIDI File",
-            "",
-            "MIDI Files (*.mid *.midi)"
+            self._last_dir,
+            "MIDI Files (*.mid *.midi)",
+            options=opts
         )
         if file_name:
+            self._last_dir = os.path.dirname(file_name)
             self.file_label.setText(os.path.basename(file_name))
             try:
-                self.midi_file = self.transformer.load_midi(file_name)
+                self.midi_file = load_midi_cached(file_name)
+                self.midi_notes = self.transformer.extract_notes(self.midi_file)
+                self._xform_cache.clear()
                 self.statusBar().showMessage("File loaded successfully")
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to load MIDI file: {str(e)}")
@@ -130,22 +224,43 @@ class MIDITransformerGUI(QMainWindow):
             QMessageBox.warning(self, "Warning", "Please select a MIDI file first")
             return
         
+        self.loading_label.setText("Processing transformation... Please wait...")
+        self.transform_button.setEnabled(False)
+        
+        # Stop any running animation timer
+        if self.update_timer:
+            self.update_timer.stop()
+            self.update_timer = None
+            self.play_button.setText("▶ Play")
+        self.play_button.setEnabled(False)
+
+        # Drop the previous result before the next one is built alongside it
+        self.notes_frames = None
+        self._frame_brushes = None
+        self.transformed_notes = None
+        self._pcm_cache.clear()
+        self.scatter.setData(x=[], y=[])
+        
+        choice = self.transform_combo.currentIndex() + 1
+        worker = TransformWorker(self._apply_transformation, choice)
+        worker.signals.finished.connect(self._on_transform_done)
+        worker.signals.error.connect(self._on_transform_error)
+        self.thread_pool.start(worker)
+    
+    def _on_transform_done(self, notes_frames):
+        self.loading_label.setText("")  # Clear loading text
+        self.transform_button.setEnabled(True)
+        
         try:
-            self.loading_label.setText("Processing transformation... Please wait...")
-            self.loading_label.repaint()  # Force immediate update
-            QApplication.processEvents()  # Process any pending events
-            
-            # Stop any running animation timer
-            if self.update_timer:
-                self.update_timer.stop()
-                self.update_timer = None
-            
-            choice = self.transform_combo.currentIndex() + 1
-            self.notes_frames = self._apply_transformation(choice)
+            self.notes_frames = notes_frames
+            self._frame_brushes = [self._pitch_brushes[notes[:, 0].astype(np.intp)]
+                                   for notes in notes_frames]
+            self._pcm_cache.clear()
             self.transformed_notes = self.notes_frames[-1] if self.notes_frames else None
             
             # Reset animation state
             self.current_frame = 0
+            self._set_plot_ranges()
             
             # Enable play button
             self.play_button.setEnabled(True)
@@ -154,24 +269,35 @@ class MIDITransformerGUI(QMainWindow):
             # Update display
             self.update_frame(0)
             
-            self.loading_label.setText("")  # Clear loading text
             self.statusBar().showMessage("Transformation applied successfully")
         except Exception as e:
-            self.loading_label.setText("")  # Clear loading text
             QMessageBox.critical(self, "Error", f"Transformation failed: {str(e)}")
     
+    def _on_transform_error(self, message):
+        self.loading_label.setText("")  # Clear loading text
+        self.transform_button.setEnabled(True)
+        QMessageBox.critical(self, "Error", f"Transformation failed: {message}")
+    
     def _apply_transformation(self, choice):
-        self.plot_widget.clear()
+        # Runs on a worker thread: must not touch any widgets
+        key = (id(self.midi_file), choice)
+        if key in self._xform_cache:
+            return self._xform_cache[key]
 
-        if choice == 1:
-            return self.transformer.game_of_life_transform(self.midi_file)
-        elif choice == 2:
-            return self.transformer.perlin_transform(self.midi_file)
-        elif choice == 3:
-            return self.transformer.lorenz_transform(self.midi_file)
-        elif choice == 4:
-            return self.transformer.brownian_transform(self.midi_file)
+        transform_fn = self._TRANSFORMS[choice]
+        notes = transform_fn(self.transformer, self.midi_notes)
+        self._xform_cache[key] = notes
+        return notes
     
+    def _set_plot_ranges(self):
+        # One view for the whole animation, so playback only swaps scatter data
+        times = np.concatenate([notes[:, 2] for notes in self.notes_frames])
+        self.plot_widget.setYRange(0, 127)
+        if len(times):
+            self.plot_widget.setXRange(times.min() - 1, times.max() + 1)
+        else:
+            self.plot_widget.setXRange(0, 10)
+
     def update_frame(self, frame=None):
         if frame is not None:
             self.current_frame = frame
@@ -181,33 +307,13 @@ class MIDITransformerGUI(QMainWindow):
         
         current_notes = self.notes_frames[self.current_frame]
         
-        # Clear previous plot
-        self.plot_widget.clear()
-        
         # Plot current state if there are notes
-        if current_notes:
-            times = [note[2] for note in current_notes]
-            pitches = [note[0] for note in current_notes]
-            
-            # Immortal C notes = Yellow
-            brushes = [
-            pg.mkBrush('yellow') if pitch % 12 == 0 else pg.mkBrush('cyan')
-            for pitch in pitches
-            ]
-            
-            # Draw scatter plot
-            scatter = pg.ScatterPlotItem(x=times, y=pitches, brush=brushes, size=10, pen=None)
-            self.plot_widget.addItem(scatter)
-
-            # Adjust plot range
-            self.plot_widget.setYRange(0, 127)
-            if times:
-                self.plot_widget.setXRange(min(times) - 1, max(times) + 1)
-            else:
-                self.plot_widget.setXRange(0, 10)
+        if len(current_notes):
+            # Update scatter plot in place; columns are views, brushes were built up front
+            self.scatter.setData(x=current_notes[:, 2], y=current_notes[:, 0],
+                                 brush=self._frame_brushes[self.current_frame])
         else:
-            self.plot_widget.setYRange(0, 127)
-            self.plot_widget.setXRange(0, 10)
+            self.scatter.setData(x=[], y=[])
 
         # Update label
         self.frame_label.setText(f"Generation: {self.current_frame}")
@@ -216,6 +322,8 @@ class MIDITransformerGUI(QMainWindow):
         if not self.update_timer:
             # Start animation
             self.update_timer = QTimer()
+            # Coarse timers may fire up to 5% late; keep generations evenly paced
+            self.update_timer.setTimerType(Qt.TimerType.PreciseTimer)
             self.update_timer.timeout.connect(self.next_frame)
             self.update_timer.start(200)  # 200ms interval
             self.play_button.setText("⏸ Pause")
@@ -230,7 +338,7 @@ class MIDITransformerGUI(QMainWindow):
             self.current_frame = (self.current_frame + 1) % len(self.notes_frames)
             
             current_notes = self.notes_frames[self.current_frame]
-            if not current_notes:
+            if not len(current_notes):
                 self.update_timer.stop()
                 self.update_timer = None
                 self.play_button.setText("▶ Play")
@@ -241,7 +349,7 @@ class MIDITransformerGUI(QMainWindow):
 
     
     def export_audio(self):
-        if not self.transformed_notes:
+        if self.transformed_notes is None:
             QMessageBox.warning(self, "Warning", "Please apply a transformation first")
             return
         
@@ -251,9 +359,9 @@ class MIDITransformerGUI(QMainWindow):
             return
         
         format_map = {
-            "WAV": "wav",
             "FLAC": "flac",
             "OGG": "ogg",
+            "WAV": "wav",
             "MP3": "mp3"
         }
         
@@ -261,19 +369,41 @@ class MIDITransformerGUI(QMainWindow):
         output_file = f"{output_path}.{format}"
         duration = self.duration_spin.value()
         
-        try:
-            # Use the current frame for export
-            notes_to_export = self.notes_frames[self.current_frame]
-            
-            if self.transformer.export_to_audio(notes_to_export, output_file, format, duration):
-                QMessageBox.information(self, "Success", f"Audio exported successfully to {output_file}")
-                self.statusBar().showMessage("Audio exported successfully")
-            else:
-                QMessageBox.critical(self, "Error", "Failed to export audio")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Export failed: {str(e)}")
+        # Use the current frame for export; re-exports of it only re-encode
+        key = (self.current_frame, duration)
+        frames = self.notes_frames
+        worker = ExportWorker(self.transformer, frames[self.current_frame],
+                              self._pcm_cache.get(key), output_file, format, duration)
+        worker.signals.finished.connect(
+            lambda signal: self._on_export_done(frames, key, signal, output_file))
+        worker.signals.error.connect(self._on_export_error)
+
+        self.export_button.setEnabled(False)
+        self.export_progress.setVisible(True)
+        self.statusBar().showMessage("Exporting audio...")
+        self.thread_pool.start(worker)
+
+    def _on_export_done(self, frames, key, signal, output_file):
+        self.export_button.setEnabled(True)
+        self.export_progress.setVisible(False)
+        # Only cache if the frames it was synthesized from are still the current ones
+        if self.notes_frames is frames and key not in self._pcm_cache:
+            if len(self._pcm_cache) >= 8:
+                self._pcm_cache.pop(next(iter(self._pcm_cache)))
+            self._pcm_cache[key] = signal
+        QMessageBox.information(self, "Success", f"Audio exported successfully to {output_file}")
+        self.statusBar().showMessage("Audio exported successfully")
+
+    def _on_export_error(self, message):
+        self.export_button.setEnabled(True)
+        self.export_progress.setVisible(False)
+        self.statusBar().showMessage("Audio export failed")
+        QMessageBox.critical(self, "Error", f"Export failed: {message}")
 
 def main():
+    # The kernels run on GUI worker threads; TBB hangs interpreter exit after that, OpenMP does not.
+    # Set here, before anything is compiled, so importing midi_transform leaves numba alone.
+    config.THREADING_LAYER_PRIORITY = ["omp", "tbb", "workqueue"]
     app = QApplication(sys.argv)
     window = MIDITransformerGUI()
     window.show()
@@ -1,223 +1,368 @@
 import mido
 import numpy as np
-import pygame
-from perlin_noise import PerlinNoise
-from scipy.integrate import odeint
-import random
+from numba import njit, prange
+from scipy.fft import irfft, next_fast_len
 import soundfile as sf
 import os
+from functools import lru_cache
+import weakref
+
+# nogil: the GUI keeps repainting while a worker thread steps the grid
+@njit(cache=True, parallel=True, nogil=True)
+def _gol_step(grid, triggered, out):
+    """Advance the zero-bordered lifespan grid by one generation into out's interior."""
+    rows, cols = grid.shape[0] - 2, grid.shape[1] - 2
+    for i in prange(1, rows + 1):  # pitch + 1
+        immortal = (i - 1) % 12 == 0  # C rows, decided once per row rather than per cell
+        for j in range(1, cols + 1):  # time column + 1
+            cell = grid[i, j]
+            # Neighbors contribute their remaining lifespan, not just 0/1; the zero
+            # border stands in for cells off the edge, so no bounds checks are needed
+            neighbors = (np.int32(grid[i - 1, j - 1]) + grid[i - 1, j] + grid[i - 1, j + 1]
+                         + grid[i, j - 1] + grid[i, j + 1]
+                         + grid[i + 1, j - 1] + grid[i + 1, j] + grid[i + 1, j + 1])
+
+            if cell > 0:
+                if immortal:
+                    out[i, j] = cell  # Immortal C notes stay forever
+                elif triggered[i - 1]:
+                    out[i, j] = max(cell, 10)  # MIDI re-trigger renews lifespan
+                elif neighbors < 2 or neighbors > 3:
+                    out[i, j] = max(0, cell - 1)  # fade
+                else:
+                    out[i, j] = cell  # stay alive
+            elif neighbors == 3 or triggered[i - 1]:
+                out[i, j] = 10  # new cell born
+            else:
+                out[i, j] = 0
+
+@njit(cache=True)
+def _lorenz_deriv(x, y, z, sigma, rho, beta):
+    """Lorenz system derivative."""
+    return sigma * (y - x), x * (rho - z) - y, x * y - beta * z
+
+@njit(cache=True)
+def _lorenz_rk4(t, x, y, z, sigma, rho, beta, max_dt):
+    """Integrate the Lorenz system with classic RK4 and return the state at every time in t."""
+    states = np.empty((len(t), 3))
+    for k in range(len(t)):
+        if k > 0:
+            # Sub-step between samples so the step never exceeds max_dt
+            span = t[k] - t[k - 1]
+            n = max(1, int(np.ceil(span / max_dt)))
+            h = span / n
+            for _ in range(n):
+                ax, ay, az = _lorenz_deriv(x, y, z, sigma, rho, beta)
+                bx, by, bz = _lorenz_deriv(x + 0.5 * h * ax, y + 0.5 * h * ay, z + 0.5 * h * az,
+                                           sigma, rho, beta)
+                cx, cy, cz = _lorenz_deriv(x + 0.5 * h * bx, y + 0.5 * h * by, z + 0.5 * h * bz,
+                                           sigma, rho, beta)
+                dx, dy, dz = _lorenz_deriv(x + h * cx, y + h * cy, z + h * cz, sigma, rho, beta)
+                x += h / 6 * (ax + 2 * bx + 2 * cx + dx)
+                y += h / 6 * (ay + 2 * by + 2 * cy + dy)
+                z += h / 6 * (az + 2 * bz + 2 * cz + dz)
+        states[k, 0], states[k, 1], states[k, 2] = x, y, z
+    return states
+
+@njit(cache=True)
+def _clamped_walk(start, steps, low, high):
+    """Walk from start by steps, clamping to [low, high] after every step."""
+    walk = np.empty(len(steps), dtype=np.int64)
+    current = start
+    for k in range(len(steps)):
+        current = min(high, max(low, current + steps[k]))
+        walk[k] = current
+    return walk
+
+@njit(cache=True)
+def _match_note_durations(is_on, notes, times, time_steps, frames_per_tick, grid,
+                          note_durations):
+    """Pair note_off with note_on events per (pitch, time step) cell and store durations."""
+    start_times = np.full((128, 128), np.nan)  # NaN: no active note in the cell
+    for k in range(len(notes)):
+        note = notes[k]
+        time_step = time_steps[k]
+        if is_on[k]:
+            start_times[note, time_step] = times[k]
+        elif not np.isnan(start_times[note, time_step]):
+            duration = times[k] - start_times[note, time_step]
+            duration_frames = int(duration * frames_per_tick)
+            grid[note, time_step] = duration_frames
+            note_durations[note, time_step] = duration_frames
+            start_times[note, time_step] = np.nan
+
+class MidiNotes:
+    """note_on events of a MIDI file as parallel NumPy arrays (one entry per event)."""
+    def __init__(self, notes, velocities, times, elapsed, starts, indices, n_messages, tempo,
+                 ticks_per_beat):
+        self.notes = notes              # pitch, uint8
+        self.velocities = velocities    # velocity, uint8
+        self.times = times              # delta time of the message, as yielded by mido
+        self.elapsed = elapsed          # accumulated time before the message
+        self.starts = starts            # accumulated time up to and including the message
+        self.indices = indices          # position of the message in the merged track
+        self.n_messages = n_messages    # total number of messages in the merged track
+        self.tempo = tempo
+        self.ticks_per_beat = ticks_per_beat
+
+    def __len__(self):
+        return len(self.notes)
 
 class MIDITransformer:
+    # Every export format is encoded in-process by libsndfile via soundfile
+    AUDIO_SUBTYPES = {'wav': 'PCM_16', 'flac': 'PCM_16', 'ogg': 'VORBIS', 'mp3': 'MPEG_LAYER_III'}
+    WRITE_CHUNK = 65536  # frames handed to the encoder per write
+    FREQ_LUT = 440.0 * 2.0 ** ((np.arange(128) - 69) / 12.0)  # Hz of each MIDI note
+    # Notes are placed on FFT bins; padding the FFT to this many seconds keeps them within 1/60 Hz
+    SYNTH_MIN_SECONDS = 60.0
+    LORENZ_MAX_DT = 0.005  # RK4 step cap for the Lorenz integration
+
     def __init__(self):
         self.sample_rate = 44100
-        pygame.mixer.init(frequency=self.sample_rate, size=-16, channels=2)
+        self._notes_cache = weakref.WeakKeyDictionary()  # MidiFile -> MidiNotes
+        self.rng = np.random.default_rng()  # shared by the random transforms; seeded once
 
-    def load_midi(self, file_path):
+    @staticmethod
+    def load_midi(file_path):
         """Load a MIDI file and return its contents."""
-        return mido.MidiFile(file_path)
-
-    def game_of_life_transform(self, midi_file, generations=100):
-        """Game of Life MIDI transformation with GoL + MIDI injection + special rules."""
-        tempo = self._get_midi_tempo(midi_file)
-        ticks_per_beat = midi_file.ticks_per_beat
+        # Same as mido.MidiFile(file_path), but with a 64KB read buffer instead of the default
+        with open(file_path, 'rb', buffering=65536) as f:
+            return MIDITransformer.load_midi_stream(f, filename=file_path)
+
+    @staticmethod
+    def load_midi_stream(fileobj, filename=None):
+        """Parse a MIDI file from an open binary file object."""
+        return mido.MidiFile(filename=filename, file=fileobj)
+
+    def extract_notes(self, midi_file):
+        """Walk a MIDI file once and collect its note_on events into a MidiNotes."""
+        # The arrays are never modified, so every caller can share them for the file's lifetime
+        cached = self._notes_cache.get(midi_file)
+        if cached is not None:
+            return cached
+
+        size = sum(len(track) for track in midi_file.tracks)
+        notes = np.empty(size, dtype=np.uint8)
+        velocities = np.empty(size, dtype=np.uint8)
+        times = np.empty(size)
+        elapsed = np.empty(size)
+        starts = np.empty(size)
+        indices = np.empty(size, dtype=np.int64)
 
-        # Create note timeline from MIDI
-        note_timeline = [[] for _ in range(generations)]
+        count = 0
+        n_messages = 0
         current_time = 0
-
-        def ticks_to_seconds(ticks):
-            return (ticks * tempo) / (ticks_per_beat * 1_000_000)
-
+        tempo = None  # First set_tempo, picked up in the same pass
         for msg in midi_file:
+            if msg.type == 'note_on':
+                notes[count] = msg.note
+                velocities[count] = msg.velocity
+                times[count] = msg.time
+                # Both running totals are stored as accumulated, never rebuilt by subtraction
+                elapsed[count] = current_time
+                starts[count] = current_time + msg.time
+                indices[count] = n_messages
+                count += 1
+            elif tempo is None and msg.type == 'set_tempo':
+                tempo = msg.tempo
             current_time += msg.time
-            if msg.type == 'note_on' and msg.velocity > 0:
-                seconds = ticks_to_seconds(current_time)
-                frame_index = int(seconds * 20)
-                if frame_index < generations:
-                    note_timeline[frame_index].append((msg.note, msg.velocity))
+            n_messages += 1
+
+        if tempo is None:
+            tempo = 500000  # Default MIDI tempo (120 BPM)
+        events = MidiNotes(notes[:count], velocities[:count], times[:count], elapsed[:count],
+                           starts[:count], indices[:count], n_messages, tempo,
+                           midi_file.ticks_per_beat)
+        self._notes_cache[midi_file] = events
+        return events
+
+    def warmup(self):
+        """Run every transform once on a single dummy note so the first real call is fast."""
+        # Compiles the Numba kernels, or loads them from the on-disk cache
+        events = MidiNotes(np.array([60], dtype=np.uint8), np.array([64], dtype=np.uint8),
+                           np.zeros(1), np.zeros(1), np.zeros(1), np.zeros(1, dtype=np.int64), 1,
+                           500000, 480)
+        self.game_of_life_transform(events, generations=2)
+        self.perlin_transform(events)
+        self.lorenz_transform(events)
+        self.brownian_transform(events)
+        self.notes_to_audio([(60, 64, 0)], duration=0.01)
+
+    def _stack_notes(self, notes, velocities, times):
+        """Stack per-note columns into an (N, 3) float array of (note, velocity, time) rows."""
+        return np.column_stack((notes, velocities, times)).astype(np.float64, copy=False)
+
+    def _as_notes(self, midi):
+        """Accept either a MidiNotes or a mido.MidiFile and return a MidiNotes."""
+        if isinstance(midi, MidiNotes):
+            return midi
+        return self.extract_notes(midi)
+
+    def game_of_life_transform(self, midi_notes, generations=100):
+        """Game of Life MIDI transformation with GoL + MIDI injection + special rules."""
+        events = self._as_notes(midi_notes)
+
+        # Which pitches MIDI triggers in each generation
+        triggered = np.zeros((generations, 128), dtype=np.bool_)
+
+        on = events.velocities > 0
+        seconds = (events.starts[on] * events.tempo) / (events.ticks_per_beat * 1_000_000)
+        frame_indices = (seconds * 20).astype(np.int64)
+        in_range = frame_indices < generations
+        triggered[frame_indices[in_range], events.notes[on][in_range]] = True
 
         # Find first active frame
-        start_frame = next((i for i, notes in enumerate(note_timeline) if notes), 0)
+        active = np.flatnonzero(triggered.any(axis=1))
+        start_frame = active[0] if len(active) else 0
+        last_trigger = active[-1] if len(active) else -1
 
-        # Initialize grid and lifespan map
-        grid = np.zeros((128, 128))
-        note_durations = np.zeros((128, 128))
+        # Two lifespan grids, swapped after every generation; lifespans never exceed 10.
+        # Both carry a one-cell zero border that the kernel reads but never writes.
+        grid = np.zeros((130, 130), dtype=np.uint8)
+        new_grid = np.zeros_like(grid)
 
-        transformed_frames = []
+        # One (N, 3) note array per generation, assigned by index
+        transformed_frames = [None] * (generations - start_frame)
 
+        seen = {}  # grid bytes -> first generation it appeared in, once MIDI input has ended
         for frame in range(start_frame, generations):
-            new_grid = np.zeros_like(grid)
-
-            # Apply Game of Life + MIDI + fading
-            for i in range(128):  # pitch
-                for j in range(128):  # time column
-                    cell_alive = grid[i, j] > 0
-
-                    # Count neighbors
-                    neighbors = self._count_neighbors(grid, i, j)
-
-                    # MIDI activity on this pitch
-                    midi_triggered = any(note == i for note, _ in note_timeline[frame])
-
-                    # Rule: Immortal C notes stay forever
-                    if i % 12 == 0 and cell_alive:
-                        new_grid[i, j] = grid[i, j]
-                        continue
-
-                    # Rule: refresh existing note if MIDI re-triggers it
-                    if cell_alive and midi_triggered:
-                        new_grid[i, j] = max(grid[i, j], 10)  # Renew lifespan
-                        continue
-
-                    # Game of Life logic
-                    if cell_alive:
-                        if neighbors < 2 or neighbors > 3:
-                            new_grid[i, j] = max(0, grid[i, j] - 1)  # fade
-                        else:
-                            new_grid[i, j] = grid[i, j]  # stay alive
-                    else:
-                        if neighbors == 3 or midi_triggered:
-                            new_grid[i, j] = 10  # new cell born
-
-            grid = new_grid
-            transformed_frames.append(self._grid_to_notes(grid))
+            _gol_step(grid, triggered[frame], new_grid)
+            grid, new_grid = new_grid, grid
+            if frame > last_trigger:
+                first = seen.setdefault(grid.tobytes(), frame)
+                if first != frame:
+                    # Without MIDI input the grid now cycles with this period; reuse those frames
+                    period = frame - first
+                    for later in range(frame, generations):
+                        transformed_frames[later - start_frame] = \
+                            transformed_frames[first + (later - first) % period - start_frame]
+                    break
+            transformed_frames[frame - start_frame] = self._grid_to_notes(grid[1:-1, 1:-1])
 
         return transformed_frames
 
 
     def _get_midi_tempo(self, midi_file):
         """Extract tempo from MIDI file."""
-        default_tempo = 500000  # Default MIDI tempo (120 BPM)
-        for msg in midi_file:
-            if msg.type == 'set_tempo':
-                return msg.tempo
-        return default_tempo
+        # Found during the single extraction pass, which is cached per file
+        return self._as_notes(midi_file).tempo
 
     def _midi_to_grid_with_duration(self, midi_file, tempo, ticks_per_beat):
         """Convert MIDI notes to a 2D grid with duration information."""
         grid = np.zeros((128, 128))  # MIDI note range (0-127)
         note_durations = np.zeros((128, 128))  # Store note durations
 
-        # Convert ticks to seconds
-        def ticks_to_seconds(ticks):
-            return (ticks * tempo) / (ticks_per_beat * 1000000)
-
-        # Track active notes and their start times
-        active_notes = {}
+        # Collect note_on/note_off events in one pass; the matching itself runs compiled
+        is_on, notes, times = [], [], []
         current_time = 0
-
         for msg in midi_file:
             current_time += msg.time
-            if msg.type == 'note_on':
-                note = int(msg.note)
-                time_step = int(current_time) % 128
-                active_notes[(note, time_step)] = current_time
-            elif msg.type == 'note_off':
-                note = int(msg.note)
-                time_step = int(current_time) % 128
-                if (note, time_step) in active_notes:
-                    start_time = active_notes[(note, time_step)]
-                    duration = current_time - start_time
-                    duration_frames = int(ticks_to_seconds(duration) * 20)
-                    grid[note, time_step] = duration_frames
-                    note_durations[note, time_step] = duration_frames
-                    del active_notes[(note, time_step)]
-
+            if msg.type == 'note_on' or msg.type == 'note_off':
+                is_on.append(msg.type == 'note_on')
+                notes.append(msg.note)
+                times.append(current_time)
+
+        times = np.array(times, dtype=np.float64)
+        time_steps = times.astype(np.int64) % 128
+        frames_per_tick = (tempo * 20.0) / (ticks_per_beat * 1000000)  # 20 frames per second
+        _match_note_durations(np.array(is_on, dtype=np.bool_), np.array(notes, dtype=np.int64),
+                              times, time_steps, frames_per_tick, grid, note_durations)
         return grid, note_durations
 
-    def perlin_transform(self, midi_file, scale=0.1, octaves=6):
+    def perlin_transform(self, midi_notes, scale=0.1, octaves=6):
         """Transform MIDI using Perlin noise."""
-        noise = PerlinNoise(octaves=octaves)
-        notes = []
-        for msg in midi_file:
-            if msg.type == 'note_on':
-                x = msg.note * scale
-                y = msg.time * scale
-                value = noise([x, y])
-                new_note = int((value + 1) * 64)
-                notes.append((new_note, msg.velocity, msg.time))
-        return notes
-
-    def lorenz_transform(self, midi_file, sigma=10, rho=28, beta=8/3):
+        events = self._as_notes(midi_notes)
+        value = self._gradient_noise(events.notes * scale, events.times * scale, octaves)
+        new_notes = np.clip(((value + 1) * 64).astype(np.int64), 0, 127)
+        return self._stack_notes(new_notes, events.velocities, events.times)
+
+    def _gradient_noise(self, x, y, octaves):
+        """Evaluate 2D gradient noise at every (x, y) pair at once."""
+        # 256 random lattice gradients, picked per lattice corner through a permutation table
+        gradients = self.rng.uniform(-1, 1, size=(256, 2))
+        perm = self.rng.permutation(256)
+        x = np.asarray(x, dtype=np.float64) * octaves
+        y = np.asarray(y, dtype=np.float64) * octaves
+        x0 = np.floor(x).astype(np.int64)
+        y0 = np.floor(y).astype(np.int64)
+
+        value = np.zeros_like(x)
+        for cx in (x0, x0 + 1):
+            for cy in (y0, y0 + 1):
+                dx = x - cx
+                dy = y - cy
+                g = gradients[perm[(perm[cx & 255] + cy) & 255]]
+                # Smoothstep falloff on each axis, as in classic Perlin noise
+                wx = 1 - np.abs(dx)
+                wy = 1 - np.abs(dy)
+                weight = (3 - 2 * wx) * wx * wx * (3 - 2 * wy) * wy * wy
+                value += weight * (g[:, 0] * dx + g[:, 1] * dy)
+        return value
+
+    def lorenz_transform(self, midi_notes, sigma=10, rho=28, beta=8/3):
         """Transform MIDI using Lorenz attractor."""
-        def lorenz_deriv(state, t):
-            x, y, z = state
-            return [sigma*(y-x), x*(rho-z)-y, x*y-beta*z]
+        events = self._as_notes(midi_notes)
 
-        notes = []
-        t = np.linspace(0, 100, len(midi_file.tracks[0]))
-        state0 = [1.0, 1.0, 1.0]
-        states = odeint(lorenz_deriv, state0, t)
+        # One sample per message in the merged track, so every note_on index is in range
+        t = np.linspace(0, 100, events.n_messages)
+        # Compiled fixed-step RK4 from (1, 1, 1); no Python callbacks per step
+        states = _lorenz_rk4(t, 1.0, 1.0, 1.0, float(sigma), float(rho), float(beta),
+                             self.LORENZ_MAX_DT)[events.indices]
 
-        for i, msg in enumerate(midi_file):
-            if msg.type == 'note_on':
-                x, y, z = states[i]
-                new_note = int((x + 30) * 2) % 128
-                new_velocity = int((y + 30) * 2) % 128
-                notes.append((new_note, new_velocity, msg.time))
-        return notes
+        new_notes = ((states[:, 0] + 30) * 2).astype(np.int64) % 128
+        new_velocities = ((states[:, 1] + 30) * 2).astype(np.int64) % 128
+        return self._stack_notes(new_notes, new_velocities, events.times)
 
-    def brownian_transform(self, midi_file, step_size=1):
+    def brownian_transform(self, midi_notes, step_size=1):
         """Transform MIDI using Brownian motion."""
-        notes = []
-        current_note = 60  # Middle C
-
-        for msg in midi_file:
-            if msg.type == 'note_on':
-                current_note += random.choice([-step_size, step_size])
-                current_note = max(0, min(127, current_note))
-                notes.append((current_note, msg.velocity, msg.time))
-        return notes
+        events = self._as_notes(midi_notes)
+        steps = self.rng.choice([-step_size, step_size], size=len(events))
+        # The clamp feeds back into every later step, so the walk is one compiled sequential pass
+        new_notes = _clamped_walk(60, steps, 0, 127)  # Start at middle C
+        return self._stack_notes(new_notes, events.velocities, events.times)
 
     def _midi_to_grid(self, midi_file):
         """Convert MIDI notes to a 2D grid for Game of Life."""
-        grid = np.zeros((128, 128))  # MIDI note range (0-127)
-        current_time = 0
-        for msg in midi_file:
-            if msg.type == 'note_on':
-                note = int(msg.note)
-                time_step = int(current_time) % 128
-                grid[note, time_step] = 1
-            current_time += msg.time
+        events = self._as_notes(midi_file)
+        grid = np.zeros((128, 128), dtype=np.uint8)  # MIDI note range (0-127)
+        # A note lands in the column of the time elapsed before its own message
+        time_steps = events.elapsed.astype(np.int64) % 128
+        grid[events.notes, time_steps] = 1
         return grid
 
     def _grid_to_notes(self, grid):
         """Convert Game of Life grid back to MIDI notes."""
-        notes = []
-        for i in range(grid.shape[0]):
-            for j in range(grid.shape[1]):
-                if grid[i, j] > 0:
-                    note = int(i)
-                    velocity = 64
-                    time = int(j)
-                    notes.append((note, velocity, time))
-        return notes
-
-    def _count_neighbors(self, grid, x, y):
-        """Count live neighbors in Game of Life."""
-        count = 0
-        for i in range(-1, 2):
-            for j in range(-1, 2):
-                if i == 0 and j == 0:
-                    continue
-                nx, ny = x + i, y + j
-                if 0 <= nx < grid.shape[0] and 0 <= ny < grid.shape[1]:
-                    count += grid[nx, ny]
-        return count
-
-    def _notes_to_audio(self, notes, duration=5.0):
-        """Convert notes to audio signal."""
-        t = np.linspace(0, duration, int(self.sample_rate * duration))
-        signal = np.zeros_like(t)
+        # Live cells in row-major order: pitch, then time column
+        pitches, times = np.nonzero(grid > 0)
+        return self._stack_notes(pitches, np.full(len(pitches), 64), times)
 
-        for note, velocity, time in notes:
-            freq = 440.0 * (2.0 ** ((note - 69) / 12.0))
-            note_signal = np.sin(2 * np.pi * freq * t)
-            note_signal *= velocity / 127.0
-            signal += note_signal
-
-        if np.max(np.abs(signal)) > 0:
-            signal = signal / np.max(np.abs(signal))
+    def notes_to_audio(self, notes, duration=5.0):
+        """Convert notes to audio signal."""
+        n_samples = int(self.sample_rate * duration)
+        # float32 samples: plenty for 16-bit output, half the memory of float64
+        signal = np.zeros(n_samples, dtype=np.float32)
+
+        if len(notes) and n_samples > 1:
+            pitches, velocities = np.asarray(notes, dtype=np.float64)[:, :2].T
+            freqs = self.FREQ_LUT[pitches.astype(np.intp)]
+
+            # Every note is one sinusoid over the whole signal: an impulse in the spectrum.
+            # Samples are spaced as np.linspace(0, duration, n_samples) would space them.
+            dt = duration / (n_samples - 1)
+            size = next_fast_len(max(n_samples, int(np.ceil(self.SYNTH_MIN_SECONDS / dt))), real=True)
+            bins = np.rint(freqs * size * dt).astype(np.int64)
+            audible = (bins > 0) & (bins < size // 2)
+
+            # irfft turns -1j * A * size / 2 at bin k into A * sin(2*pi*k*n/size);
+            # a complex64 spectrum makes it return float32 samples
+            spectrum = np.zeros(size // 2 + 1, dtype=np.complex64)
+            np.add.at(spectrum, bins[audible], -0.5j * size * velocities[audible] / 127.0)
+            signal = irfft(spectrum, n=size, workers=-1)[:n_samples].copy()
+
+        # Peak from max/min avoids an abs() copy; the buffer is ours, so scale it in place
+        peak = max(signal.max(), -signal.min()) if len(signal) else 0
+        if peak > 0:
+            signal /= peak
 
         return signal
 
@@ -225,11 +370,25 @@ class MIDITransformer:
         """
         Export transformed notes to an audio file.
         """
-        signal = self._notes_to_audio(notes, duration)
-        os.makedirs(os.path.dirname(output_file), exist_ok=True)
+        signal = self.notes_to_audio(notes, duration)
+        return self.write_audio(signal, output_file, format)
+
+    def write_audio(self, signal, output_file, format='wav'):
+        """
+        Encode an already synthesized signal to an audio file.
+        """
+        output_dir = os.path.dirname(output_file)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
 
         try:
-            sf.write(output_file, signal, self.sample_rate, format=format)
+            channels = signal.shape[1] if signal.ndim > 1 else 1
+            # libsndfile writes small blocks; a 1MB buffer turns them into few large writes
+            with open(output_file, 'wb', buffering=1 << 20) as f, \
+                    sf.SoundFile(f, 'w', self.sample_rate, channels, format=format,
+                                 subtype=self.AUDIO_SUBTYPES.get(format.lower())) as out:
+                for start in range(0, len(signal), self.WRITE_CHUNK):
+                    out.write(signal[start:start + self.WRITE_CHUNK])
             print(f"Successfully exported audio to {output_file}")
             return True
         except Exception as e:
@@ -237,3 +396,23 @@ class MIDITransformer:
             return False
 
     # The visualize_pattern method is intentionally omitted because visualization is now handled via PyQtGraph.
+
+@lru_cache(maxsize=8)
+def _load_midi_cached(path, mtime_ns, size):
+    """Parse a MIDI file once per (path, mtime, size)."""
+    return MIDITransformer.load_midi(path)
+
+def load_midi_cached(file_path, st=None):
+    """Load a MIDI file, reusing the last parse while the file is unchanged."""
+    if st is None:
+        st = os.stat(file_path)
+    return _load_midi_cached(os.path.abspath(file_path), st.st_mtime_ns, st.st_size)
+
+_transformer = None
+
+def get_transformer():
+    """Return the process-wide MIDITransformer, creating it on first use."""
+    global _transformer
+    if _transformer is None:
+        _transformer = MIDITransformer()
+    return _transformer